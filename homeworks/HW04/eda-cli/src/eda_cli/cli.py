@@ -1,17 +1,21 @@
 from __future__ import annotations
 
+import hashlib
+import inspect
 from pathlib import Path
 from typing import Optional
 
+import numpy as np
 import pandas as pd
 import typer
 
 from .core import (
     DatasetSummary,
+    categorize_object_columns,
+    compute_all,
     compute_quality_flags,
-    correlation_matrix,
+    downcast_float_columns,
     flatten_summary_for_print,
-    missing_table,
     summarize_dataset,
     top_categories,
 )
@@ -24,6 +28,47 @@ from .viz import (
 
 app = typer.Typer(help="Мини-CLI для EDA CSV-файлов")
 
+# Сигнатуру core.top_categories проверяем один раз на импорт — дальше
+# ветвимся по булеву флагу, без try/except TypeError на каждый вызов
+_TOPCATS_ACCEPTS_K = "k" in inspect.signature(top_categories).parameters
+
+# Файлы крупнее этого порога читаем кусками, чтобы не удваивать пиковую память
+_CHUNKED_READ_THRESHOLD_BYTES = 100 * 1024 * 1024
+_CHUNK_ROWS = 250_000
+
+# Сколько строк парсить в быстром режиме overview --head-only
+_HEAD_ROWS = 100_000
+
+# Каталог кеша распарсенных датафреймов (Parquet читается на порядок быстрее CSV)
+_CACHE_DIR = Path.home() / ".cache" / "eda_cli"
+
+
+def _count_csv_rows(path: Path) -> int:
+    """
+    Число строк данных в CSV по количеству переводов строки,
+    без полного парсинга файла.
+
+    Переводы строк внутри закавыченных полей здесь не различаются,
+    поэтому для таких файлов оценка может быть завышена.
+    """
+    if path.stat().st_size == 0:
+        return 0
+
+    # mmap + векторное сравнение: numpy сравнивает байты SIMD-инструкциями,
+    # упираясь только в пропускную способность памяти
+    buf = np.memmap(path, dtype=np.uint8, mode="r")
+    newlines = int(np.count_nonzero(buf == 0x0A))
+    if buf[-1] != 0x0A:
+        newlines += 1  # файл без завершающего \n
+    return max(newlines - 1, 0)  # минус строка заголовка
+
+
+def _cache_path(path: Path, sep: str, encoding: str) -> Path:
+    """Путь к parquet-кешу, привязанный к файлу, его mtime и параметрам парсинга."""
+    raw = f"{path.resolve()}|{path.stat().st_mtime_ns}|{sep}|{encoding}"
+    key = hashlib.blake2b(raw.encode("utf-8")).hexdigest()[:16]
+    return _CACHE_DIR / f"{key}.parquet"
+
 
 def _load_csv(
     path: Path,
@@ -32,17 +77,91 @@ def _load_csv(
 ) -> pd.DataFrame:
     if not path.exists():
         raise typer.BadParameter(f"Файл '{path}' не найден")
+
+    # overview + report по одному и тому же файлу — частый сценарий;
+    # кешируем распарсенный DataFrame, чтобы не парсить CSV дважды
+    cache = _cache_path(path, sep, encoding)
+    if cache.exists():
+        try:
+            return pd.read_parquet(cache, engine="pyarrow")
+        except Exception:  # noqa: BLE001 — битый/несовместимый кеш просто игнорируем
+            pass
+
     try:
-        return pd.read_csv(path, sep=sep, encoding=encoding)
+        try:
+            # pyarrow парсит CSV в несколько потоков — на больших/широких файлах
+            # это заметно быстрее однопоточного C-движка pandas
+            df = pd.read_csv(path, sep=sep, encoding=encoding, engine="pyarrow")
+        except (ImportError, ValueError):
+            # pyarrow не установлен или не поддерживает параметры (например, regex-sep) —
+            # читаем C-движком; большие файлы — кусками, чтобы парсер отдавал
+            # данные потоково и не держал в памяти файл целиком плюс DataFrame
+            try:
+                if path.stat().st_size > _CHUNKED_READ_THRESHOLD_BYTES:
+                    chunks = pd.read_csv(
+                        path,
+                        sep=sep,
+                        encoding=encoding,
+                        engine="c",
+                        chunksize=_CHUNK_ROWS,
+                        low_memory=False,
+                        cache_dates=True,
+                    )
+                    df = pd.concat(chunks, copy=False, ignore_index=True)
+                else:
+                    df = pd.read_csv(
+                        path,
+                        sep=sep,
+                        encoding=encoding,
+                        engine="c",
+                        low_memory=False,
+                        cache_dates=True,
+                        memory_map=True,
+                    )
+            except ValueError:
+                # сепаратор не для C-движка (например, regex) — пусть pandas
+                # сам выберет python-движок, как делал исходный read_csv
+                df = pd.read_csv(path, sep=sep, encoding=encoding)
     except Exception as exc:  # noqa: BLE001
         raise typer.BadParameter(f"Не удалось прочитать CSV: {exc}") from exc
 
+    try:
+        _CACHE_DIR.mkdir(parents=True, exist_ok=True)
+        df.to_parquet(cache, engine="pyarrow", compression="zstd")
+    except Exception:  # noqa: BLE001 — нет pyarrow/места/прав: работаем без кеша
+        pass
+
+    return df
+
+
+def _write_table_csv(df: pd.DataFrame, out_path: Path, index: bool = False) -> None:
+    """
+    Пишет таблицу в CSV многопоточным писателем pyarrow (C++),
+    без pyarrow откатывается на pandas to_csv.
+    """
+    try:
+        import pyarrow as pa
+        import pyarrow.csv as pacsv
+    except ImportError:
+        df.to_csv(out_path, index=index)
+        return
+
+    if index:
+        # У Arrow нет понятия индекса — выносим его в явную колонку "column"
+        df = df.rename_axis("column").reset_index()
+    pacsv.write_csv(pa.Table.from_pandas(df, preserve_index=False), str(out_path))
+
 
 @app.command()
 def overview(
     path: str = typer.Argument(..., help="Путь к CSV-файлу."),
     sep: str = typer.Option(",", help="Разделитель в CSV."),
     encoding: str = typer.Option("utf-8", help="Кодировка файла."),
+    head_only: bool = typer.Option(
+        False,
+        help=f"Быстрый режим: статистики по первым {_HEAD_ROWS} строкам, "
+        "общее число строк — подсчётом переводов строки.",
+    ),
 ) -> None:
     """
     Напечатать краткий обзор датасета:
@@ -50,12 +169,29 @@ def overview(
     - типы;
     - простая табличка по колонкам.
     """
-    df = _load_csv(Path(path), sep=sep, encoding=encoding)
+    csv_path = Path(path)
+    if head_only:
+        # Для огромных файлов не парсим всё: типы и статистики оцениваем
+        # по первым _HEAD_ROWS строкам, а общее число строк считаем
+        # дешёвым сканом файла на '\n'
+        if not csv_path.exists():
+            raise typer.BadParameter(f"Файл '{csv_path}' не найден")
+        try:
+            df = pd.read_csv(csv_path, sep=sep, encoding=encoding, nrows=_HEAD_ROWS)
+        except Exception as exc:  # noqa: BLE001
+            raise typer.BadParameter(f"Не удалось прочитать CSV: {exc}") from exc
+        n_rows_total = _count_csv_rows(csv_path)
+    else:
+        df = _load_csv(csv_path, sep=sep, encoding=encoding)
+        n_rows_total = len(df)
+
     summary: DatasetSummary = summarize_dataset(df)
     summary_df = flatten_summary_for_print(summary)
 
-    typer.echo(f"Строк: {summary.n_rows}")
+    typer.echo(f"Строк: {n_rows_total}")
     typer.echo(f"Столбцов: {summary.n_cols}")
+    if head_only and n_rows_total > summary.n_rows:
+        typer.echo(f"(статистики по колонкам — по первым {summary.n_rows} строкам)")
     typer.echo("\nКолонки:")
     typer.echo(summary_df.to_string(index=False))
 
@@ -91,29 +227,20 @@ def report(
     out_root.mkdir(parents=True, exist_ok=True)
 
     df = _load_csv(Path(path), sep=sep, encoding=encoding)
+    # float32 хватает для статистик и картинок отчёта, а памяти нужно вдвое меньше
+    df = downcast_float_columns(df)
+    # строковые колонки с повторами — в category, чтобы дальше работать по кодам
+    df = categorize_object_columns(df)
 
-    # 1. Обзор
-    summary = summarize_dataset(df)
+    # 1. Обзор: summary, пропуски и корреляция за один проход по колонкам
+    summary, missing_df, corr_df = compute_all(df)
     summary_df = flatten_summary_for_print(summary)
-    missing_df = missing_table(df)
-    corr_df = correlation_matrix(df)
 
-    # 2. Top-k категорий (пробуем передать параметр в core.py, если поддерживается)
-    try:
-        top_cats = top_categories(df, k=top_k_categories)  # если в core.py есть k
-    except TypeError:
-        # если core.top_categories не принимает k — режем результат здесь
-        top_cats = top_categories(df)
-
-    # подстрахуемся и ограничим top-k на стороне CLI в любом случае
-    if isinstance(top_cats, dict):
-        trimmed = {}
-        for col, tbl in top_cats.items():
-            try:
-                trimmed[col] = tbl.head(top_k_categories)
-            except Exception:
-                trimmed[col] = tbl
-        top_cats = trimmed
+    # 2. Top-k категорий (параметр подобран статически при импорте)
+    if _TOPCATS_ACCEPTS_K:
+        top_cats = top_categories(df, k=top_k_categories)
+    else:
+        top_cats = top_categories(df, max_columns=max_cat_columns, top_k=top_k_categories)
 
     # 3. Качество в целом
     quality_flags = compute_quality_flags(summary, missing_df)
@@ -121,80 +248,103 @@ def report(
     # 4. Проблемные колонки по пропускам (по новому порогу)
     problematic_missing = pd.DataFrame()
     if not missing_df.empty and "missing_share" in missing_df.columns:
-        # missing_df у вас с index=имя колонки (судя по логике сохранения index=True)
-        problematic_missing = missing_df[missing_df["missing_share"] >= float(min_missing_share)].copy()
+        # missing_df у вас с index=имя колонки (судя по логике сохранения index=True);
+        # булевой маски достаточно, копия здесь не нужна
+        problematic_missing = missing_df[missing_df["missing_share"] >= float(min_missing_share)]
 
     # 5. Сохраняем табличные артефакты
-    summary_df.to_csv(out_root / "summary.csv", index=False)
+    _write_table_csv(summary_df, out_root / "summary.csv", index=False)
     if not missing_df.empty:
-        missing_df.to_csv(out_root / "missing.csv", index=True)
+        _write_table_csv(missing_df, out_root / "missing.csv", index=True)
     if not corr_df.empty:
-        corr_df.to_csv(out_root / "correlation.csv", index=True)
+        _write_table_csv(corr_df, out_root / "correlation.csv", index=True)
     save_top_categories_tables(top_cats, out_root / "top_categories")
 
-    # 6. Markdown-отчёт
+    # Дублируем таблицы в Parquet: последующие инструменты читают их
+    # колоночно и без повторного парсинга CSV
+    try:
+        summary_df.to_parquet(out_root / "summary.parquet", engine="pyarrow", compression="zstd")
+        if not missing_df.empty:
+            missing_df.to_parquet(out_root / "missing.parquet", engine="pyarrow", compression="zstd")
+        if not corr_df.empty:
+            corr_df.to_parquet(out_root / "correlation.parquet", engine="pyarrow", compression="zstd")
+    except ImportError:
+        # без pyarrow/fastparquet остаёмся только с CSV
+        pass
+
+    # 6. Markdown-отчёт: собираем в памяти и пишем одним вызовом
+    # (вместо ~25 отдельных write с кодированием и syscall на каждый)
     md_path = out_root / "report.md"
-    with md_path.open("w", encoding="utf-8") as f:
-        f.write(f"# {title}\n\n")
-        f.write(f"Исходный файл: `{Path(path).name}`\n\n")
-        f.write(f"Строк: **{summary.n_rows}**, столбцов: **{summary.n_cols}**\n\n")
-
-        # Параметры отчёта 
-        f.write("## Настройки отчёта\n\n")
-        f.write(f"- max_hist_columns: **{max_hist_columns}**\n")
-        f.write(f"- max_cat_columns: **{max_cat_columns}**\n")
-        f.write(f"- top_k_categories: **{top_k_categories}**\n")
-        f.write(f"- min_missing_share: **{min_missing_share:.2%}**\n\n")
-
-        f.write("## Качество данных (эвристики)\n\n")
-        f.write(f"- Оценка качества: **{quality_flags['quality_score']:.2f}**\n")
-        f.write(f"- Макс. доля пропусков по колонке: **{quality_flags['max_missing_share']:.2%}**\n")
-        f.write(f"- Слишком мало строк: **{quality_flags['too_few_rows']}**\n")
-        f.write(f"- Слишком много колонок: **{quality_flags['too_many_columns']}**\n")
-        f.write(f"- Слишком много пропусков: **{quality_flags['too_many_missing']}**\n")
-        f.write(f"- Есть константные колонки: **{quality_flags['has_constant_columns']}**\n")
-        f.write(
-            f"- Есть категориальные признаки с высокой кардинальностью: "
-            f"**{quality_flags['has_high_cardinality_categoricals']}**\n\n"
-        )
-
-        f.write("## Колонки\n\n")
-        f.write("См. файл `summary.csv`.\n\n")
-
-        f.write("## Пропуски\n\n")
-        if missing_df.empty:
-            f.write("Пропусков нет или датасет пуст.\n\n")
-        else:
-            f.write("См. файлы `missing.csv` и `missing_matrix.png`.\n\n")
-
-            f.write(f"### Проблемные колонки (missing_share >= {min_missing_share:.2%})\n\n")
-            if problematic_missing.empty:
-                f.write("Проблемных колонок по заданному порогу не найдено.\n\n")
-            else:
-                f.write("Колонки:\n\n")
-                for col_name, row in problematic_missing.iterrows():
-                    ms = float(row["missing_share"])
-                    mc = int(row["missing_count"])
-                    f.write(f"- **{col_name}**: missing_count={mc}, missing_share={ms:.2%}\n")
-                f.write("\n")
-
-        f.write("## Корреляция числовых признаков\n\n")
-        if corr_df.empty:
-            f.write("Недостаточно числовых колонок для корреляции.\n\n")
+    buf: list[str] = []
+    buf.append(f"# {title}\n\n")
+    buf.append(f"Исходный файл: `{Path(path).name}`\n\n")
+    buf.append(f"Строк: **{summary.n_rows}**, столбцов: **{summary.n_cols}**\n\n")
+
+    # Параметры отчёта
+    buf.append("## Настройки отчёта\n\n")
+    buf.append(f"- max_hist_columns: **{max_hist_columns}**\n")
+    buf.append(f"- max_cat_columns: **{max_cat_columns}**\n")
+    buf.append(f"- top_k_categories: **{top_k_categories}**\n")
+    buf.append(f"- min_missing_share: **{min_missing_share:.2%}**\n\n")
+
+    buf.append("## Качество данных (эвристики)\n\n")
+    buf.append(f"- Оценка качества: **{quality_flags['quality_score']:.2f}**\n")
+    buf.append(f"- Макс. доля пропусков по колонке: **{quality_flags['max_missing_share']:.2%}**\n")
+    buf.append(f"- Слишком мало строк: **{quality_flags['too_few_rows']}**\n")
+    buf.append(f"- Слишком много колонок: **{quality_flags['too_many_columns']}**\n")
+    buf.append(f"- Слишком много пропусков: **{quality_flags['too_many_missing']}**\n")
+    buf.append(f"- Есть константные колонки: **{quality_flags['has_constant_columns']}**\n")
+    buf.append(
+        f"- Есть категориальные признаки с высокой кардинальностью: "
+        f"**{quality_flags['has_high_cardinality_categoricals']}**\n\n"
+    )
+
+    buf.append("## Колонки\n\n")
+    buf.append("См. файл `summary.csv`.\n\n")
+
+    buf.append("## Пропуски\n\n")
+    if missing_df.empty:
+        buf.append("Пропусков нет или датасет пуст.\n\n")
+    else:
+        buf.append("См. файлы `missing.csv` и `missing_matrix.png`.\n\n")
+
+        buf.append(f"### Проблемные колонки (missing_share >= {min_missing_share:.2%})\n\n")
+        if problematic_missing.empty:
+            buf.append("Проблемных колонок по заданному порогу не найдено.\n\n")
         else:
-            f.write("См. `correlation.csv` и `correlation_heatmap.png`.\n\n")
-
-        f.write("## Категориальные признаки\n\n")
-        if not top_cats:
-            f.write("Категориальные/строковые признаки не найдены.\n\n")
-        else:
-            f.write(
-                f"См. файлы в папке `top_categories/` "
-                f"(макс. колонок: {max_cat_columns}, top-{top_k_categories} значений).\n\n"
+            buf.append("Колонки:\n\n")
+            # Строки собираем векторно, без iterrows и упаковки каждой строки в Series
+            lines = (
+                "- **"
+                + problematic_missing.index.astype(str)
+                + "**: missing_count="
+                + problematic_missing["missing_count"].astype(int).astype(str)
+                + ", missing_share="
+                + problematic_missing["missing_share"].map("{:.2%}".format)
+                + "\n"
             )
+            buf.append("".join(lines))
+            buf.append("\n")
+
+    buf.append("## Корреляция числовых признаков\n\n")
+    if corr_df.empty:
+        buf.append("Недостаточно числовых колонок для корреляции.\n\n")
+    else:
+        buf.append("См. `correlation.csv` и `correlation_heatmap.png`.\n\n")
+
+    buf.append("## Категориальные признаки\n\n")
+    if not top_cats:
+        buf.append("Категориальные/строковые признаки не найдены.\n\n")
+    else:
+        buf.append(
+            f"См. файлы в папке `top_categories/` "
+            f"(макс. колонок: {max_cat_columns}, top-{top_k_categories} значений).\n\n"
+        )
+
+    buf.append("## Гистограммы числовых колонок\n\n")
+    buf.append(f"См. файлы `hist_*.png` (максимум {max_hist_columns} колонок).\n")
 
-        f.write("## Гистограммы числовых колонок\n\n")
-        f.write(f"См. файлы `hist_*.png` (максимум {max_hist_columns} колонок).\n")
+    md_path.write_text("".join(buf), encoding="utf-8")
 
     # 7. Картинки
     plot_histograms_per_column(df, out_root, max_columns=max_hist_columns)
@@ -203,7 +353,7 @@ def report(
 
     typer.echo(f"Отчёт сгенерирован в каталоге: {out_root}")
     typer.echo(f"- Основной markdown: {md_path}")
-    typer.echo("- Табличные файлы: summary.csv, missing.csv, correlation.csv, top_categories/*.csv")
+    typer.echo("- Табличные файлы: summary.csv, missing.csv, correlation.csv, top_categories/*")
     typer.echo("- Графики: hist_*.png, missing_matrix.png, correlation_heatmap.png")
 
 
@@ -1,8 +1,14 @@
 from __future__ import annotations
 
+import hashlib
+import inspect
+import os
+from concurrent.futures import ThreadPoolExecutor
 from dataclasses import dataclass, asdict
-from typing import Any, Dict, List, Optional, Sequence
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Sequence, Tuple
 
+import numpy as np
 import pandas as pd
 from pandas.api import types as ptypes
 
@@ -56,14 +62,26 @@ def summarize_dataset(
     n_rows, n_cols = df.shape
     columns: List[ColumnSummary] = []
 
+    # Общие статистики считаем сразу по всему фрейму: pandas выполняет
+    # редукции по колонкам в C, читая каждую колонку один раз,
+    # вместо пяти отдельных проходов на колонку в Python-цикле
+    non_null_all = df.notna().sum()
+    unique_all = df.nunique(dropna=True)
+    numeric_df = df.select_dtypes(include="number")
+    num_stats = (
+        numeric_df.agg(["min", "max", "mean", "std"])
+        if not numeric_df.empty
+        else pd.DataFrame()
+    )
+
     for name in df.columns:
         s = df[name]
         dtype_str = str(s.dtype)
 
-        non_null = int(s.notna().sum())
+        non_null = int(non_null_all[name])
         missing = n_rows - non_null
         missing_share = float(missing / n_rows) if n_rows > 0 else 0.0
-        unique = int(s.nunique(dropna=True))
+        unique = int(unique_all[name])
 
         # Примерные значения выводим как строки
         examples = (
@@ -79,10 +97,18 @@ def summarize_dataset(
         std_val: Optional[float] = None
 
         if is_numeric and non_null > 0:
-            min_val = float(s.min())
-            max_val = float(s.max())
-            mean_val = float(s.mean())
-            std_val = float(s.std())
+            if name in num_stats.columns:
+                min_val = float(num_stats.at["min", name])
+                max_val = float(num_stats.at["max", name])
+                mean_val = float(num_stats.at["mean", name])
+                std_val = float(num_stats.at["std", name])
+            else:
+                # например bool: is_numeric_dtype — True, но select_dtypes("number")
+                # такие колонки не включает
+                min_val = float(s.min())
+                max_val = float(s.max())
+                mean_val = float(s.mean())
+                std_val = float(s.std())
 
         columns.append(
             ColumnSummary(
@@ -104,6 +130,245 @@ def summarize_dataset(
     return DatasetSummary(n_rows=n_rows, n_cols=n_cols, columns=columns)
 
 
+def _example_values(s: pd.Series, non_null: int, limit: int) -> List[str]:
+    if non_null == 0:
+        return []
+    return s.dropna().astype(str).unique()[:limit].tolist()
+
+
+def _numeric_column_summary(
+    s: pd.Series,
+    n_rows: int,
+    example_values_per_column: int,
+) -> ColumnSummary:
+    """
+    Статистики числовой колонки: nan-редукции numpy по единому float64-массиву.
+    """
+    arr = s.to_numpy(dtype=np.float64, na_value=np.nan)
+    missing = int(np.isnan(arr).sum())
+    non_null = n_rows - missing
+
+    min_val: Optional[float] = None
+    max_val: Optional[float] = None
+    mean_val: Optional[float] = None
+    std_val: Optional[float] = None
+    if non_null > 0:
+        min_val = float(np.nanmin(arr))
+        max_val = float(np.nanmax(arr))
+        mean_val = float(np.nanmean(arr))
+        std_val = float(np.nanstd(arr, ddof=1)) if non_null > 1 else float("nan")
+
+    return ColumnSummary(
+        name=s.name,
+        dtype=str(s.dtype),
+        non_null=non_null,
+        missing=missing,
+        missing_share=float(missing / n_rows) if n_rows > 0 else 0.0,
+        unique=int(s.nunique(dropna=True)),
+        example_values=_example_values(s, non_null, example_values_per_column),
+        is_numeric=True,
+        min=min_val,
+        max=max_val,
+        mean=mean_val,
+        std=std_val,
+    )
+
+
+def _other_column_summary(
+    s: pd.Series,
+    n_rows: int,
+    example_values_per_column: int,
+) -> ColumnSummary:
+    """
+    Статистики нечисловой колонки (object/category/даты и т.п.).
+    """
+    non_null = int(s.notna().sum())
+    missing = n_rows - non_null
+    return ColumnSummary(
+        name=s.name,
+        dtype=str(s.dtype),
+        non_null=non_null,
+        missing=missing,
+        missing_share=float(missing / n_rows) if n_rows > 0 else 0.0,
+        unique=int(s.nunique(dropna=True)),
+        example_values=_example_values(s, non_null, example_values_per_column),
+        is_numeric=False,
+    )
+
+
+def _column_summary(
+    s: pd.Series,
+    n_rows: int,
+    example_values_per_column: int,
+) -> ColumnSummary:
+    """
+    Статистики одной колонки одним чтением её данных.
+    """
+    if ptypes.is_numeric_dtype(s):
+        return _numeric_column_summary(s, n_rows, example_values_per_column)
+    return _other_column_summary(s, n_rows, example_values_per_column)
+
+
+# Кеш сгенерированных под схему суммаризаторов: в памяти и исходниками на диске
+_CACHE_DIR = Path.home() / ".cache" / "eda_cli"
+_SPECIALIZED_SUMMARIZERS: Dict[str, Any] = {}
+
+# Версия формата генерируемого кода; поднимать при изменении сигнатуры
+# summarize_columns или используемых хелперов, чтобы старые файлы кеша
+# просто игнорировались
+_SPECIALIZED_VERSION = 1
+
+
+def _specialized_summarizer(df: pd.DataFrame):
+    """
+    Возвращает функцию суммаризации колонок, сгенерированную под схему df.
+
+    Когда одна и та же схема обрабатывается многократно (тот же CSV в
+    CI-конвейере), ветвления по dtype в общем пути — чистые накладные расходы.
+    При первой встрече схемы генерируем исходник, где для каждой колонки уже
+    подставлен числовой либо объектный путь, компилируем его один раз и
+    кешируем: в памяти на процесс и файлом в ~/.cache/eda_cli между запусками.
+    """
+    raw = "|".join(f"{name}:{dtype}" for name, dtype in zip(df.columns, df.dtypes))
+    key = hashlib.blake2b(raw.encode("utf-8")).hexdigest()[:16]
+    fn = _SPECIALIZED_SUMMARIZERS.get(key)
+    if fn is not None:
+        return fn
+
+    src_path = _CACHE_DIR / f"specialized_v{_SPECIALIZED_VERSION}_{key}.py"
+
+    def _compile(source: str):
+        namespace = {
+            "_numeric_column_summary": _numeric_column_summary,
+            "_other_column_summary": _other_column_summary,
+        }
+        exec(compile(source, str(src_path), "exec"), namespace)
+        return namespace["summarize_columns"]
+
+    if src_path.exists():
+        try:
+            fn = _compile(src_path.read_text(encoding="utf-8"))
+            # файл может скомпилироваться, но не совпасть по соглашению вызова —
+            # тогда он тоже считается устаревшим
+            if len(inspect.signature(fn).parameters) != 4:
+                fn = None
+        except Exception:  # noqa: BLE001 — битый/устаревший кеш: перегенерируем
+            fn = None
+
+    if fn is None:
+        lines = [
+            "def summarize_columns(df, n_rows, example_values_per_column, ex):",
+            f'    """Сгенерировано eda_cli под схему {key}: dtype-ветвления разрешены заранее."""',
+            "    futures = [",
+        ]
+        for name in df.columns:
+            helper = (
+                "_numeric_column_summary"
+                if ptypes.is_numeric_dtype(df[name])
+                else "_other_column_summary"
+            )
+            lines.append(
+                f"        ex.submit({helper}, df[{name!r}], n_rows, example_values_per_column),"
+            )
+        lines += ["    ]", "    return [f.result() for f in futures]", ""]
+        source = "\n".join(lines)
+        try:
+            _CACHE_DIR.mkdir(parents=True, exist_ok=True)
+            src_path.write_text(source, encoding="utf-8")
+        except OSError:
+            pass
+        fn = _compile(source)
+
+    _SPECIALIZED_SUMMARIZERS[key] = fn
+    return fn
+
+
+def compute_all(
+    df: pd.DataFrame,
+    example_values_per_column: int = 3,
+) -> Tuple[DatasetSummary, pd.DataFrame, pd.DataFrame]:
+    """
+    Summary, таблица пропусков и корреляция за один обход колонок.
+
+    summarize_dataset + missing_table + correlation_matrix по отдельности
+    читают одни и те же колонки трижды; здесь статистики и счётчики пропусков
+    собираются в общем проходе, а корреляция получает список числовых колонок
+    из него же, без повторного сканирования типов.
+    """
+    n_rows, n_cols = df.shape
+    if n_cols > 1:
+        # Колонки независимы, а numpy-редукции отпускают GIL, поэтому
+        # статистики считаем пулом потоков; сам план обхода колонок
+        # сгенерирован под схему df, без dtype-ветвлений на вызов
+        summarize_columns = _specialized_summarizer(df)
+        with ThreadPoolExecutor(max_workers=min(n_cols, os.cpu_count() or 1)) as ex:
+            try:
+                columns = summarize_columns(df, n_rows, example_values_per_column, ex)
+            except Exception:  # noqa: BLE001
+                # кеш скомпилировался, но не подходит по соглашению вызова —
+                # забываем его и считаем генерик-путём, как с битым parquet-кешем
+                _SPECIALIZED_SUMMARIZERS.clear()
+                columns = list(
+                    ex.map(
+                        lambda name: _column_summary(df[name], n_rows, example_values_per_column),
+                        df.columns,
+                    )
+                )
+    else:
+        columns = [
+            _column_summary(df[name], n_rows, example_values_per_column)
+            for name in df.columns
+        ]
+    summary = DatasetSummary(n_rows=n_rows, n_cols=n_cols, columns=columns)
+
+    if df.empty:
+        missing_df = pd.DataFrame(columns=["missing_count", "missing_share"])
+    else:
+        missing_df = pd.DataFrame(
+            {
+                "missing_count": [c.missing for c in columns],
+                "missing_share": [c.missing_share for c in columns],
+            },
+            index=df.columns,
+        ).sort_values("missing_share", ascending=False)
+
+    numeric_names = [
+        c.name for c in columns if c.is_numeric and not ptypes.is_bool_dtype(df[c.name])
+    ]
+    corr_df = correlation_matrix(df[numeric_names]) if numeric_names else pd.DataFrame()
+
+    return summary, missing_df, corr_df
+
+
+def downcast_float_columns(df: pd.DataFrame) -> pd.DataFrame:
+    """
+    Понижает float64-колонки до float32 (на месте).
+
+    Для EDA-статистик и графиков точности float32 достаточно, а объём
+    данных, прокачиваемый через корреляцию и гистограммы, падает вдвое.
+    """
+    for name in df.columns[df.dtypes == np.float64]:
+        df[name] = df[name].astype(np.float32, copy=False)
+    return df
+
+
+def categorize_object_columns(df: pd.DataFrame) -> pd.DataFrame:
+    """
+    Переводит object-колонки с невысокой кардинальностью в category (на месте).
+
+    Последующие value_counts/nunique/groupby работают по целочисленным кодам
+    вместо хеширования Python-строк, что заметно быстрее на больших фреймах.
+    """
+    n_rows = len(df)
+    if n_rows == 0:
+        return df
+    for name in df.columns[df.dtypes == object]:
+        s = df[name]
+        if s.nunique(dropna=True) / n_rows < 0.5:
+            df[name] = s.astype("category", copy=False)
+    return df
+
+
 def missing_table(df: pd.DataFrame) -> pd.DataFrame:
     """
     Таблица пропусков по колонкам: count/share.
@@ -125,13 +390,69 @@ def missing_table(df: pd.DataFrame) -> pd.DataFrame:
     return result
 
 
-def correlation_matrix(df: pd.DataFrame) -> pd.DataFrame:
+# Ширина блока колонок для тайлового расчёта корреляции
+_CORR_TILE = 256
+
+
+def _corr_tiled(values: np.ndarray) -> np.ndarray:
+    """
+    Корреляция Пирсона блоками 256x256 колонок.
+
+    На очень широких фреймах один np.corrcoef создаёт центрированную копию
+    O(n*k) плюс результат k*k, вымывая кеш; здесь стандартизованная матрица
+    перемножается по тайлам, и считается только верхний треугольник.
     """
-    Корреляция Пирсона для числовых колонок.
+    n, k = values.shape
+    with np.errstate(invalid="ignore", divide="ignore"):
+        x = (values - values.mean(axis=0)) / values.std(axis=0, ddof=0)
+
+    corr = np.empty((k, k), dtype=np.float64)
+    for i in range(0, k, _CORR_TILE):
+        xi = x[:, i : i + _CORR_TILE]
+        for j in range(i, k, _CORR_TILE):
+            block = xi.T @ x[:, j : j + _CORR_TILE] / n
+            corr[i : i + _CORR_TILE, j : j + _CORR_TILE] = block
+            if j > i:
+                corr[j : j + _CORR_TILE, i : i + _CORR_TILE] = block.T
+    np.clip(corr, -1.0, 1.0, out=corr)
+    return corr
+
+
+def correlation_matrix(df: pd.DataFrame, method: str = "pearson") -> pd.DataFrame:
+    """
+    Корреляция числовых колонок (по умолчанию Пирсон).
     """
     numeric_df = df.select_dtypes(include="number")
     if numeric_df.empty:
         return pd.DataFrame()
+
+    if method != "pearson":
+        # Попарный путь pandas считает каждую пару дважды; матрица симметрична,
+        # поэтому считаем только верхний треугольник и отражаем его
+        cols = numeric_df.columns
+        k = len(cols)
+        corr = np.empty((k, k), dtype=np.float64)
+        for i in range(k):
+            s_i = numeric_df.iloc[:, i]
+            # как у pandas: для колонки без валидных значений на диагонали NaN
+            corr[i, i] = 1.0 if s_i.notna().any() else np.nan
+            for j in range(i + 1, k):
+                corr[i, j] = corr[j, i] = s_i.corr(numeric_df.iloc[:, j], method=method)
+        return pd.DataFrame(corr, index=cols, columns=cols)
+
+    values = numeric_df.to_numpy(dtype=np.float64, copy=False)
+    if values.shape[1] >= 2 and not np.isnan(values).any():
+        # Без пропусков вся матрица считается BLAS-вызовами —
+        # сильно быстрее попарного цикла pandas на широких фреймах;
+        # очень широкие фреймы считаем тайлами ради кеш-локальности
+        if values.shape[1] > _CORR_TILE:
+            corr = _corr_tiled(values)
+        else:
+            with np.errstate(invalid="ignore", divide="ignore"):
+                corr = np.corrcoef(values, rowvar=False)
+        return pd.DataFrame(corr, index=numeric_df.columns, columns=numeric_df.columns)
+
+    # С NaN сохраняем pairwise-complete семантику pandas
     return numeric_df.corr(numeric_only=True)
 
 
@@ -154,15 +475,32 @@ def top_categories(
 
     for name in candidate_cols[:max_columns]:
         s = df[name]
-        vc = s.value_counts(dropna=True).head(top_k)
-        if vc.empty:
-            continue
-        share = vc / vc.sum()
+        if isinstance(s.dtype, pd.CategoricalDtype):
+            # По кодам категорий: bincount + argpartition строят top-k за O(N + k log k)
+            # без хеширования Python-строк
+            codes = s.cat.codes.to_numpy()
+            counts = np.bincount(codes[codes >= 0], minlength=len(s.cat.categories))
+            if counts.sum() == 0:
+                continue
+            k = min(top_k, counts.size)
+            idx = np.argpartition(-counts, k - 1)[:k]
+            idx = idx[np.argsort(-counts[idx], kind="stable")]
+            # не показываем категории без наблюдений — как в object-пути
+            idx = idx[counts[idx] > 0]
+            top_values = s.cat.categories[idx].astype(str)
+            top_counts = counts[idx]
+        else:
+            vc = s.value_counts(dropna=True).head(top_k)
+            if vc.empty:
+                continue
+            top_values = vc.index.astype(str)
+            top_counts = vc.to_numpy()
+
         table = pd.DataFrame(
             {
-                "value": vc.index.astype(str),
-                "count": vc.values,
-                "share": share.values,
+                "value": top_values,
+                "count": top_counts,
+                "share": top_counts / top_counts.sum(),
             }
         )
         result[name] = table
@@ -1,8 +1,11 @@
 from __future__ import annotations
 
+import os
+from concurrent.futures import ProcessPoolExecutor
 from pathlib import Path
 from typing import Dict, Iterable, List, Union
 
+import matplotlib
 import matplotlib.pyplot as plt
 import numpy as np
 import pandas as pd
@@ -16,6 +19,28 @@ def _ensure_dir(path: PathLike) -> Path:
     return p
 
 
+def _render_histogram(values: np.ndarray, name: str, out_path: Path, bins: int) -> Path:
+    """
+    Рисует одну гистограмму в PNG. Вынесена на уровень модуля,
+    чтобы её можно было отдать в пул процессов.
+    """
+    matplotlib.use("Agg")  # в воркере нет дисплея, рендерим сразу в растр
+
+    # Биннинг делаем сами C-циклом numpy (отпускает GIL) и отдаём matplotlib
+    # готовые счётчики — без его Python-поиска границ внутри hist()
+    counts, edges = np.histogram(values, bins=bins)
+
+    fig, ax = plt.subplots()
+    ax.bar(edges[:-1], counts, width=np.diff(edges), align="edge")
+    ax.set_title(f"Histogram of {name}")
+    ax.set_xlabel(name)
+    ax.set_ylabel("Count")
+    fig.tight_layout()
+    fig.savefig(out_path)
+    plt.close(fig)
+    return out_path
+
+
 def plot_histograms_per_column(
     df: pd.DataFrame,
     out_dir: PathLike,
@@ -24,31 +49,31 @@ def plot_histograms_per_column(
 ) -> List[Path]:
     """
     Для числовых колонок строит по отдельной гистограмме.
+    Колонки независимы, поэтому рендеринг распараллелен по процессам.
     Возвращает список путей к PNG.
     """
     out_dir = _ensure_dir(out_dir)
     numeric_df = df.select_dtypes(include="number")
 
-    paths: List[Path] = []
+    # Готовим задания заранее: в воркер уходит только numpy-массив колонки,
+    # а не весь DataFrame
+    tasks: List[tuple] = []
     for i, name in enumerate(numeric_df.columns[:max_columns]):
         s = numeric_df[name].dropna()
         if s.empty:
             continue
+        tasks.append((s.to_numpy(), str(name), out_dir / f"hist_{i+1}_{name}.png"))
 
-        fig, ax = plt.subplots()
-        ax.hist(s.values, bins=bins)
-        ax.set_title(f"Histogram of {name}")
-        ax.set_xlabel(name)
-        ax.set_ylabel("Count")
-        fig.tight_layout()
-
-        out_path = out_dir / f"hist_{i+1}_{name}.png"
-        fig.savefig(out_path)
-        plt.close(fig)
-
-        paths.append(out_path)
+    if len(tasks) <= 1 or (os.cpu_count() or 1) == 1:
+        return [_render_histogram(values, name, path, bins) for values, name, path in tasks]
 
-    return paths
+    with ProcessPoolExecutor(max_workers=min(len(tasks), os.cpu_count() or 1)) as ex:
+        futures = [
+            ex.submit(_render_histogram, values, name, path, bins)
+            for values, name, path in tasks
+        ]
+        # порядок результатов — как порядок колонок
+        return [future.result() for future in futures]
 
 
 def plot_missing_matrix(df: pd.DataFrame, out_path: PathLike) -> Path:
@@ -114,12 +139,27 @@ def save_top_categories_tables(
     out_dir: PathLike,
 ) -> List[Path]:
     """
-    Сохраняет top-k категорий по колонкам в отдельные CSV.
+    Сохраняет top-k категорий одним parquet-файлом: таблицы всех колонок
+    склеены, исходный признак лежит в колонке "column". Одна запись вместо
+    файла на колонку, а при чтении можно фильтровать по "column".
+    Без pyarrow — по-старому отдельными CSV.
     """
     out_dir = _ensure_dir(out_dir)
-    paths: List[Path] = []
-    for name, table in top_cats.items():
-        out_path = out_dir / f"top_values_{name}.csv"
-        table.to_csv(out_path, index=False)
-        paths.append(out_path)
-    return paths
+    if not top_cats:
+        return []
+
+    try:
+        combined = pd.concat(
+            [table.assign(column=name) for name, table in top_cats.items()],
+            ignore_index=True,
+        )
+        out_path = out_dir / "top_categories.parquet"
+        combined.to_parquet(out_path, engine="pyarrow", compression="zstd")
+        return [out_path]
+    except ImportError:
+        paths: List[Path] = []
+        for name, table in top_cats.items():
+            out_path = out_dir / f"top_values_{name}.csv"
+            table.to_csv(out_path, index=False)
+            paths.append(out_path)
+        return paths
@@ -3,6 +3,7 @@ from __future__ import annotations
 import pandas as pd
 
 from eda_cli.core import (
+    compute_all,
     compute_quality_flags,
     correlation_matrix,
     flatten_summary_for_print,
@@ -60,6 +61,69 @@ def test_correlation_and_top_categories():
     assert "value" in city_table.columns
     assert len(city_table) <= 2
 
+def test_compute_all_matches_separate_functions():
+    df = _sample_df()
+    summary, missing_df, corr_df = compute_all(df)
+
+    expected_summary = summarize_dataset(df)
+    assert summary.n_rows == expected_summary.n_rows
+    assert summary.n_cols == expected_summary.n_cols
+    assert [c.to_dict() for c in summary.columns] == [
+        c.to_dict() for c in expected_summary.columns
+    ]
+
+    expected_missing = missing_table(df)
+    assert missing_df.sort_index().equals(expected_missing.sort_index())
+
+    expected_corr = correlation_matrix(df)
+    assert corr_df.columns.tolist() == expected_corr.columns.tolist()
+
+
+def test_top_categories_categorical_matches_object_path():
+    # NaN, равные счётчики и неиспользуемая категория с нулевым счётчиком
+    values = ["a", "a", "a", "b", "b", "c", None]
+    df = pd.DataFrame(
+        {
+            "obj": pd.Series(values, dtype=object),
+            "cat": pd.Categorical(values, categories=["a", "b", "c", "unused"]),
+        }
+    )
+
+    top_cats = top_categories(df, max_columns=5, top_k=2)
+    obj_table = top_cats["obj"]
+    cat_table = top_cats["cat"]
+
+    assert list(cat_table["value"]) == list(obj_table["value"]) == ["a", "b"]
+    assert list(cat_table["count"]) == list(obj_table["count"]) == [3, 2]
+    assert cat_table["share"].tolist() == obj_table["share"].tolist()
+
+    # top_k больше числа категорий: нулевые счётчики и NaN не попадают в таблицу
+    top_cats_all = top_categories(df, max_columns=5, top_k=10)
+    cat_all = top_cats_all["cat"]
+    assert list(cat_all["value"]) == ["a", "b", "c"]
+    assert list(cat_all["count"]) == [3, 2, 1]
+
+
+def test_count_csv_rows_edge_cases(tmp_path):
+    from eda_cli.cli import _count_csv_rows
+
+    with_newline = tmp_path / "with_newline.csv"
+    with_newline.write_bytes(b"a,b\n1,2\n3,4\n")
+    assert _count_csv_rows(with_newline) == 2
+
+    no_newline = tmp_path / "no_newline.csv"
+    no_newline.write_bytes(b"a,b\n1,2\n3,4")
+    assert _count_csv_rows(no_newline) == 2
+
+    header_only = tmp_path / "header_only.csv"
+    header_only.write_bytes(b"a,b\n")
+    assert _count_csv_rows(header_only) == 0
+
+    empty = tmp_path / "empty.csv"
+    empty.write_bytes(b"")
+    assert _count_csv_rows(empty) == 0
+
+
 def test_quality_flags_constant_and_high_cardinality():
     n = 10
     df = pd.DataFrame(